@@ -64,16 +64,44 @@
 # not from its source category (armories, towers, big_towers).
 # Hidden POIs are stored per category in config.json.
 
-import sys, os, json, ctypes, traceback, shutil
+import sys, os, json, ctypes, traceback, shutil, hashlib, functools, mmap
+from collections import OrderedDict
+from dataclasses import dataclass
+from ctypes import wintypes
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 
+def udir_path() -> str:
+    # Folder of all runtime files, see udir. Does not create it, so it is safe at import time.
+    return os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "HuntOverlay")
+
+# numba is optional. With it the hover hit test is compiled, without it the NumPy version is used.
+# The compiled kernel is cached next to the other runtime files, bundled builds have no writable
+# source folder for numba's default __pycache__ location.
+os.environ.setdefault("NUMBA_CACHE_DIR", os.path.join(udir_path(), "numba"))
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# orjson is optional. It parses and serializes in C, which matters for data.json
+# and for config.json writes. The stdlib json module is used when it is missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Map order is intentionally set to the release order requested.
 MAPS = ["Stillwater Bayou", "Lawson Delta", "DeSalle", "Mammon's Gulch"]
 
 CONFIG_VERSION = "1.0.1"
 
 user32 = ctypes.windll.user32
+
+# Bound once with an explicit prototype so each poll skips the attribute lookup and argument guessing.
 GetKey = user32.GetAsyncKeyState
+GetKey.argtypes = [ctypes.c_int]
+GetKey.restype = ctypes.c_short
 
 # Win32 virtual key codes used by defaults and modifier detection.
 VK_TAB = 0x09
@@ -87,13 +115,79 @@ VK_SHIFT = 0x10
 VK_CONTROL = 0x11
 VK_MENU = 0x12
 
+# RegisterHotKey modifiers and the message it posts.
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_NOREPEAT = 0x4000
+WM_HOTKEY = 0x0312
+HOTKEY_ID_HIDE_HOVERED = 1
+
+# Poll interval for the tick timer, which watches hotkey edges. Only the high bit of
+# GetAsyncKeyState is read, so a tap shorter than one tick is missed, keep this near one frame.
+# Hover is resolved on demand when hide_hovered fires and does not need the tick.
+TICK_MS = 16
+
+# Map label paint objects, shared by every frame.
+LABEL_BG = QtGui.QBrush(QtGui.QColor(0, 0, 0, 150))
+LABEL_PEN = QtGui.QPen(QtGui.QColor(230, 230, 230), 1)
+
 DEFAULT_HIDDEN_POSSIBLE_XP = [
     "armories:1508:2096",
     "big_towers:1320:3328",
 ]
 
-def key(vk: int) -> bool:
-    return (GetKey(vk) & 0x8000) != 0
+# Thread local keyboard state. Only valid for windows that have focus, see KeyCaptureDialog.
+GetKeyboardState = user32.GetKeyboardState
+GetKeyboardState.argtypes = [ctypes.POINTER(ctypes.c_ubyte)]
+GetKeyboardState.restype = wintypes.BOOL
+
+# Source categories merged into possible_xp. Their position is part of the possible_xp hide id.
+XP_SOURCES = ("towers", "big_towers", "armories")
+
+def hide_id(xi: int, yi: int, src: str = "") -> int:
+    """
+    Integer form of a hide key, used for the in memory hidden sets.
+    Bits 0..15 yi, 16..31 xi, 32 and up the XP_SOURCES position plus one (0 outside possible_xp).
+    """
+    s = XP_SOURCES.index(src) + 1 if src else 0
+    return (s << 32) | ((xi & 0xFFFF) << 16) | (yi & 0xFFFF)
+
+def hide_ids(x, y, s):
+    """
+    hide_id for whole arrays: float64 grid coordinates x, y and int64 source codes s
+    (XP_SOURCES position plus one, or 0). np.rint rounds half to even like round().
+    """
+    xi = np.rint(x).astype(np.int64)
+    yi = np.rint(y).astype(np.int64)
+    return (s << 32) | ((xi & 0xFFFF) << 16) | (yi & 0xFFFF)
+
+def hide_id_from_key(tkey: str, s: str):
+    """
+    Parses a config.json hide key, "xi:yi" or "src:xi:yi" for possible_xp.
+    Returns None for entries that do not match the category.
+    """
+    parts = str(s).split(":")
+    try:
+        if tkey == "possible_xp":
+            if len(parts) != 3 or parts[0] not in XP_SOURCES:
+                return None
+            return hide_id(int(parts[1]), int(parts[2]), parts[0])
+        if len(parts) != 2:
+            return None
+        return hide_id(int(parts[0]), int(parts[1]))
+    except ValueError:
+        return None
+
+def hide_id_to_key(hid: int) -> str:
+    def signed16(n):
+        return n - 0x10000 if n >= 0x8000 else n
+    xi = signed16((hid >> 16) & 0xFFFF)
+    yi = signed16(hid & 0xFFFF)
+    s = hid >> 32
+    if s:
+        return f"{XP_SOURCES[s - 1]}:{xi}:{yi}"
+    return f"{xi}:{yi}"
 
 def topmost(hwnd: int) -> None:
     try:
@@ -114,7 +208,7 @@ def bd() -> str:
 
 def udir() -> str:
     # All runtime files live here.
-    p = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "HuntOverlay")
+    p = udir_path()
     os.makedirs(p, exist_ok=True)
     return p
 
@@ -141,19 +235,64 @@ def ensure_user_file(filename: str) -> str:
 
     return dst
 
-ICON = os.path.join(bd(), "myicon.ico") if os.path.isfile(os.path.join(bd(), "myicon.ico")) else ""
-DATA_PATH = ensure_user_file("data.json")
-STYLE_PATH = ensure_user_file("poiData.json")
-CONFIG_PATH = os.path.join(udir(), "config.json")
+# User file paths are resolved on first use instead of at import, so the copies and
+# directory creation in ensure_user_file run after QApplication is up.
+_ICON = None
+_DATA_PATH = None
+_STYLE_PATH = None
+_CONFIG_PATH = None
+
+def get_icon() -> str:
+    global _ICON
+    if _ICON is None:
+        p = os.path.join(bd(), "myicon.ico")
+        _ICON = p if os.path.isfile(p) else ""
+    return _ICON
+
+def get_data_path() -> str:
+    global _DATA_PATH
+    if _DATA_PATH is None:
+        _DATA_PATH = ensure_user_file("data.json")
+    return _DATA_PATH
+
+def get_style_path() -> str:
+    global _STYLE_PATH
+    if _STYLE_PATH is None:
+        _STYLE_PATH = ensure_user_file("poiData.json")
+    return _STYLE_PATH
+
+def get_config_path() -> str:
+    global _CONFIG_PATH
+    if _CONFIG_PATH is None:
+        _CONFIG_PATH = os.path.join(udir(), "config.json")
+    return _CONFIG_PATH
 
 def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size > 0:
+            # orjson parses straight from the mapped file, no bytes copy of it is made first.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+                obj = orjson.loads(buf)
+        else:
+            buf = f.read()
+            obj = orjson.loads(buf) if orjson is not None else json.loads(buf)
+    return obj
+
+def dump_json(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+def write_file_atomic(path: str, buf: bytes) -> None:
+    # Write next to the target and swap it in, so a crash never leaves a torn file.
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(buf)
+    os.replace(tmp, path)
 
 def save_json(path: str, obj) -> None:
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(json.dumps(obj, indent=2))
+        write_file_atomic(path, dump_json(obj))
     except:
         pass
 
@@ -229,21 +368,146 @@ def vk_to_label(vk: int) -> str:
     if vk == VK_ESC: return "Esc"
     return f"VK_{vk}"
 
-def rotate90cw_norm(x, y):
+def rotate90cw_norm_vec(x, y):
     """
-    Converts 4096 map coordinates into normalized u,v (0..1) after 90° clockwise rotation.
-    v is top down for painting.
+    Converts arrays of 4096 map coordinates into normalized u,v (0..1) after 90° clockwise rotation.
+    v is top down for painting. Returns float32 u, v arrays.
     """
-    xr = float(y)
-    yr = 4095.0 - float(x)
-    u = xr / 4095.0
-    v = yr / 4095.0
-    if u < 0: u = 0.0
-    if u > 1: u = 1.0
-    if v < 0: v = 0.0
-    if v > 1: v = 1.0
+    scale = np.float32(4095.0)
+    u = np.asarray(y, dtype=np.float32) / scale
+    v = (scale - np.asarray(x, dtype=np.float32)) / scale
+    np.clip(u, 0.0, 1.0, out=u)
+    np.clip(v, 0.0, 1.0, out=v)
     return u, v
 
+@dataclass
+class PointArray:
+    """
+    Screen points of one POI type on the selected map, kept as parallel arrays.
+    x, y int32 pixel coordinates, ids int64 hide ids, hidden a bool mask.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    ids: np.ndarray
+    hidden: np.ndarray
+    # Uniform grid over the rect, see build_grid. Point indices sorted by cell and
+    # the start offset of each cell in that order.
+    order: np.ndarray = None
+    starts: np.ndarray = None
+    # Points hover skips, when it differs from hidden. See Overlay._refresh_xp_hover_skip.
+    hover_skip: np.ndarray = None
+
+    @classmethod
+    def empty(cls):
+        e = np.zeros(0, dtype=np.int32)
+        return cls(e, e, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool))
+
+    def __len__(self):
+        return len(self.x)
+
+def build_grid(px, py, grid):
+    """
+    Buckets screen points into the uniform grid (left, top, cell, gw, gh).
+    Returns (order, starts) in CSR form, cell k holds order[starts[k]:starts[k + 1]].
+    """
+    left, top, cell, gw, gh = grid
+    gx = np.clip((px - left) // cell, 0, gw - 1)
+    gy = np.clip((py - top) // cell, 0, gh - 1)
+    key = gy * gw + gx
+    order = np.argsort(key, kind="stable").astype(np.int32)
+    starts = np.searchsorted(key[order], np.arange(gw * gh + 1))
+    return order, starts
+
+def grid_window(grid, mx: float, my: float):
+    """
+    Cell range (x0, x1, y0, y1) of the 3x3 cells around (mx, my), clipped to the grid, or None
+    when the cursor is more than a cell outside it. With the cell size equal to the hover radius
+    these cells hold every point that can be within the radius.
+    """
+    left, top, cell, gw, gh = grid
+    cx = int((mx - left) // cell)
+    cy = int((my - top) // cell)
+    if cx < -1 or cy < -1 or cx > gw or cy > gh:
+        return None
+    return max(cx - 1, 0), min(cx + 1, gw - 1), max(cy - 1, 0), min(cy + 1, gh - 1)
+
+@functools.lru_cache(maxsize=64)
+def point_stamp(fill: int, border: int, r: int, dpr: float) -> QtGui.QPixmap:
+    """
+    One POI circle (fill and border as 0xAARRGGBB, radius r) rasterized into a pixmap.
+    The circle is centered on pixel (r + 2, r + 2), so blitting it at (x - r - 2, y - r - 2)
+    gives the same pixels as drawEllipse(QPoint(x, y), r, r) with a 2 px border.
+    """
+    size = 2 * r + 4
+    pix = QtGui.QPixmap(int(np.ceil(size * dpr)), int(np.ceil(size * dpr)))
+    pix.setDevicePixelRatio(dpr)
+    pix.fill(QtCore.Qt.transparent)
+    p = QtGui.QPainter(pix)
+    p.setRenderHint(QtGui.QPainter.Antialiasing)
+    p.setPen(QtGui.QPen(QtGui.QColor.fromRgba(border), 2))
+    p.setBrush(QtGui.QBrush(QtGui.QColor.fromRgba(fill)))
+    p.drawEllipse(QtCore.QPoint(r + 2, r + 2), r, r)
+    p.end()
+    return pix
+
+def _nearest_poi_np(px, py, hidden, order, starts, gw, x0, x1, y0, y1, mx: float, my: float, r2: float):
+    """
+    Index and squared distance of the closest non hidden point within sqrt(r2) of (mx, my),
+    looking only at grid cells x0..x1, y0..y1, see build_grid. Returns (-1, r2) when there is none.
+    Equally close points resolve to the highest index, like the full scan this replaced.
+    """
+    # Cells of one grid row are contiguous in order, so each row is a single slice.
+    parts = []
+    for row in range(y0, y1 + 1):
+        a, b = starts[row * gw + x0], starts[row * gw + x1 + 1]
+        if a < b:
+            parts.append(order[a:b])
+    if not parts:
+        return -1, r2
+    cand = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    # float32 temporaries, squared in place. int32 minus a scalar would otherwise promote to float64.
+    dx = np.subtract(px[cand], mx, dtype=np.float32)
+    dy = np.subtract(py[cand], my, dtype=np.float32)
+    dx *= dx
+    dy *= dy
+    d2 = np.add(dx, dy, out=dx)
+    d2[hidden[cand]] = np.inf
+    d = float(d2.min())
+    if d <= r2:
+        return int(cand[d2 == d].max()), d
+    return -1, r2
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _nearest_poi_jit(px, py, hidden, order, starts, gw, x0, x1, y0, y1, mx, my, r2):
+        best = -1
+        bd = r2
+        for row in range(y0, y1 + 1):
+            for k in range(starts[row * gw + x0], starts[row * gw + x1 + 1]):
+                i = order[k]
+                if hidden[i]:
+                    continue
+                dx = px[i] - mx
+                dy = py[i] - my
+                d = dx * dx + dy * dy
+                # Ties go to the highest index, same as _nearest_poi_np. Cells are not visited in index order.
+                if d < bd or (d == bd and i > best):
+                    bd = d
+                    best = i
+        return best, bd
+
+    nearest_poi = _nearest_poi_jit
+else:
+    nearest_poi = _nearest_poi_np
+
+def warm_nearest_poi():
+    """
+    Runs the hover kernel once on empty input with the argument types _update_hover passes, so
+    numba compiles or loads it from cache now rather than on the first hover tick.
+    """
+    e = np.zeros(0, dtype=np.int32)
+    nearest_poi(e, e, np.zeros(0, dtype=bool), e, np.zeros(2, dtype=np.int64), 1, 0, 0, 0, 0, 0.0, 0.0, 1.0)
+
 def detect_data_format(game_data) -> str:
     """
     Supports two formats
@@ -258,21 +522,25 @@ def detect_data_format(game_data) -> str:
             return "named"
     return "unknown"
 
-def get_map_block(game_data, fmt: str, map_name: str):
-    if fmt == "named":
-        for m in game_data:
-            if isinstance(m, dict) and m.get("n") == map_name:
-                return m
-        return None
-
-    if fmt == "indexed_r":
-        idx = MAPS.index(map_name)
-        for m in game_data:
-            if isinstance(m, dict) and m.get("i") == idx:
-                return m
-        return None
-
-    return None
+def build_map_index(game_data, fmt: str) -> dict:
+    """
+    Maps map name to its data.json block in one pass. The first block for a map wins,
+    same as a linear scan would.
+    """
+    index = {}
+    if fmt not in ("named", "indexed_r") or not isinstance(game_data, list):
+        return index
+    for m in game_data:
+        if not isinstance(m, dict):
+            continue
+        if fmt == "named":
+            name = m.get("n")
+        else:
+            i = m.get("i")
+            name = MAPS[i] if isinstance(i, int) and 0 <= i < len(MAPS) else None
+        if isinstance(name, str):
+            index.setdefault(name, m)
+    return index
 
 def get_category_list(map_block, fmt: str, category: str):
     if not isinstance(map_block, dict):
@@ -288,13 +556,22 @@ def get_category_list(map_block, fmt: str, category: str):
         return []
     return []
 
-def find_style_by_category(style_json, category: str):
+def build_style_index(style_json) -> dict:
+    """Maps category name to its poiData.json spec, see build_map_index."""
+    index = {}
     if not isinstance(style_json, dict):
-        return None
+        return index
     for _, spec in style_json.items():
-        if isinstance(spec, dict) and spec.get("categories") == category:
-            return spec
-    return None
+        if isinstance(spec, dict) and "categories" in spec:
+            try:
+                index.setdefault(spec["categories"], spec)
+            except TypeError:
+                continue
+    return index
+
+def find_style_by_category(index: dict, category: str):
+    # index comes from build_style_index.
+    return index.get(category)
 
 def qcolor_from_any(value, fallback: QtGui.QColor) -> QtGui.QColor:
     try:
@@ -341,28 +618,29 @@ def load_or_replace_config():
     Option C
     If config.json missing OR version mismatch, replace with a fresh default config.
     """
-    if not os.path.isfile(CONFIG_PATH):
+    if not os.path.isfile(get_config_path()):
         d = build_default_config()
-        save_json(CONFIG_PATH, d)
+        save_json(get_config_path(), d)
         return d
 
     try:
-        d = load_json(CONFIG_PATH)
+        d = load_json(get_config_path())
     except:
         d = {}
 
     if not isinstance(d, dict) or d.get("version") != CONFIG_VERSION:
         d = build_default_config()
-        save_json(CONFIG_PATH, d)
+        save_json(get_config_path(), d)
         return d
 
     return d
 
 class KeyCaptureDialog(QtWidgets.QDialog):
     """
-    Small capture dialog that polls GetAsyncKeyState and records one non modifier key press.
+    Small capture dialog that polls the keyboard state and records one non modifier key press.
     Ctrl Alt Shift are captured and returned too.
     Esc cancels.
+    The dialog is modal and focused, so GetKeyboardState reads all 256 keys in one call.
     """
     def __init__(self, action_name: str, p=None):
         super().__init__(p)
@@ -380,32 +658,37 @@ class KeyCaptureDialog(QtWidgets.QDialog):
         self._timer.timeout.connect(self._poll)
         self._timer.start(10)
 
-        self._prev_down = set()
+        self._kbd = (ctypes.c_ubyte * 256)()
+        self._prev_down = np.zeros(256, dtype=np.uint8)
 
     def _poll(self):
-        if key(VK_ESC):
-            self.reject()
+        if not GetKeyboardState(self._kbd):
             return
+        cur = np.frombuffer(self._kbd, dtype=np.uint8) & 0x80
 
-        mods = {"ctrl": key(VK_CONTROL), "alt": key(VK_MENU), "shift": key(VK_SHIFT)}
+        if cur[VK_ESC]:
+            self.reject()
+            return
 
-        down = set()
-        for vk in range(1, 256):
-            if key(vk):
-                down.add(vk)
+        mods = {"ctrl": bool(cur[VK_CONTROL]), "alt": bool(cur[VK_MENU]), "shift": bool(cur[VK_SHIFT])}
 
-        new_down = [vk for vk in down if vk not in self._prev_down]
-        self._prev_down = down
+        # Keys that went down since the last poll. Index 0 is not a key.
+        new_down = np.flatnonzero(cur & ~self._prev_down)
+        self._prev_down = cur
 
-        for vk in new_down:
-            if vk in (VK_CONTROL, VK_MENU, VK_SHIFT):
+        for vk in new_down.tolist():
+            if vk == 0 or vk in (VK_CONTROL, VK_MENU, VK_SHIFT):
                 continue
-            self.result_bind = {"vk": int(vk), "ctrl": bool(mods["ctrl"]), "alt": bool(mods["alt"]), "shift": bool(mods["shift"])}
+            self.result_bind = {"vk": int(vk), "ctrl": mods["ctrl"], "alt": mods["alt"], "shift": mods["shift"]}
             self.accept()
             return
 
 class SVPad(QtWidgets.QWidget):
     changed = QtCore.Signal(int, int)
+
+    # Rendered gradients kept per (hue, w, h), dragging the hue slider back and forth reuses them.
+    PIXMAP_CACHE_SIZE = 16
+
     def __init__(self, p=None):
         super().__init__(p)
         self.setMinimumSize(180, 140)
@@ -413,6 +696,7 @@ class SVPad(QtWidgets.QWidget):
         self.s = 255
         self.v = 255
         self.cross = QtCore.QPointF(0, 0)
+        self._pixmap_cache = OrderedDict()
 
     def setHue(self, h: int):
         self.h = max(0, min(359, int(h)))
@@ -439,25 +723,56 @@ class SVPad(QtWidgets.QWidget):
             self.setSV(S, V)
             self.changed.emit(self.s, self.v)
 
-    def paintEvent(self, _):
-        p = QtGui.QPainter(self)
-        p.setRenderHint(QtGui.QPainter.Antialiasing)
+    def resizeEvent(self, e):
+        self._pixmap_cache.clear()
+        super().resizeEvent(e)
+
+    def _gradient_pixmap(self) -> QtGui.QPixmap:
+        """
+        White to hue horizontally with a black overlay vertically, rendered once per hue and size.
+        """
+        w, h = self.width(), self.height()
+        k = (self.h, w, h)
+        pix = self._pixmap_cache.get(k)
+        if pix is not None:
+            self._pixmap_cache.move_to_end(k)
+            return pix
+
+        dpr = self.devicePixelRatioF()
+        pix = QtGui.QPixmap(max(1, int(round(w * dpr))), max(1, int(round(h * dpr))))
+        pix.setDevicePixelRatio(dpr)
+        r = QtCore.QRect(0, 0, w, h)
+        p = QtGui.QPainter(pix)
         hc = QtGui.QColor()
         hc.setHsv(self.h, 255, 255)
-        g = QtGui.QLinearGradient(0, 0, self.width(), 0)
+        g = QtGui.QLinearGradient(0, 0, w, 0)
         g.setColorAt(0, QtGui.QColor(255, 255, 255))
         g.setColorAt(1, hc)
-        p.fillRect(self.rect(), g)
-        g2 = QtGui.QLinearGradient(0, 0, 0, self.height())
+        p.fillRect(r, g)
+        g2 = QtGui.QLinearGradient(0, 0, 0, h)
         g2.setColorAt(0, QtGui.QColor(0, 0, 0, 0))
         g2.setColorAt(1, QtGui.QColor(0, 0, 0, 255))
-        p.fillRect(self.rect(), g2)
+        p.fillRect(r, g2)
+        p.end()
+
+        self._pixmap_cache[k] = pix
+        while len(self._pixmap_cache) > self.PIXMAP_CACHE_SIZE:
+            self._pixmap_cache.popitem(last=False)
+        return pix
+
+    def paintEvent(self, _):
+        p = QtGui.QPainter(self)
+        p.drawPixmap(0, 0, self._gradient_pixmap())
+        p.setRenderHint(QtGui.QPainter.Antialiasing)
         p.setPen(QtGui.QPen(QtGui.QColor(240, 240, 240), 1))
         p.drawEllipse(self.cross, 5, 5)
         p.setPen(QtGui.QPen(QtGui.QColor(20, 20, 20), 1))
         p.drawEllipse(self.cross, 3, 3)
 
 class AdvColorDlg(QtWidgets.QDialog):
+    # Emitted on every edit while the dialog is open, for live previews.
+    colorChanged = QtCore.Signal(QtGui.QColor)
+
     def __init__(self, start: QtGui.QColor, p=None):
         super().__init__(p)
         self.setWindowTitle("Pick Color")
@@ -496,7 +811,8 @@ class AdvColorDlg(QtWidgets.QDialog):
             b = QtWidgets.QPushButton()
             b.setFixedSize(20, 20)
             b.setStyleSheet(f"border:1px solid #3a3c40;background:{hx};")
-            b.clicked.connect(lambda _, h=hx: self._set_hex(h))
+            b.setProperty("hex", hx)
+            b.clicked.connect(self._preset_clicked)
             grid.addWidget(b, i // 8, i % 8)
 
         def row(lbl, spin):
@@ -544,6 +860,11 @@ class AdvColorDlg(QtWidgets.QDialog):
 
     def _preview(self, c: QtGui.QColor):
         self.prev.setStyleSheet(f"background: rgb({c.red()},{c.green()},{c.blue()}); border:1px solid #3a3c40;")
+        self.colorChanged.emit(QtGui.QColor(c))
+
+    def _preset_clicked(self):
+        # All preset buttons share this slot, the color is stored on the button.
+        self._set_hex(str(self.sender().property("hex")))
 
     def _set_hex(self, hx: str):
         c = QtGui.QColor(hx if hx.startswith("#") else "#" + hx)
@@ -609,8 +930,22 @@ class AdvColorDlg(QtWidgets.QDialog):
         c.setHsv(self.h.value(), self.pad.s, self.pad.v)
         return c
 
+@functools.lru_cache(maxsize=512)
+def _chip_stylesheet(fr: int, fg: int, fb: int, br: int, bg: int, bb: int) -> str:
+    return (
+        "QPushButton{"
+        f"border:2px solid rgb({br},{bg},{bb});"
+        "border-radius:10px;"
+        f"background: rgb({fr},{fg},{fb});"
+        "}"
+        "QPushButton:hover { background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(255,255,255,50), stop:1 transparent); }"
+    )
+
 class DotChip(QtWidgets.QPushButton):
+    # changed is the committed color. previewed follows the picker while it is open
+    # and reports the original fill again if the pick is cancelled.
     changed = QtCore.Signal(QtGui.QColor)
+    previewed = QtCore.Signal(QtGui.QColor)
     def __init__(self, fill: QtGui.QColor, border=QtGui.QColor(85, 85, 85), p=None):
         super().__init__(p)
         self.fill = QtGui.QColor(fill)
@@ -618,19 +953,17 @@ class DotChip(QtWidgets.QPushButton):
         self.setFixedSize(20, 20)
         self.setCursor(QtCore.Qt.PointingHandCursor)
         self.clicked.connect(self.pick)
+        self._css = None
         self._paint()
 
     def _paint(self):
         f = self.fill
         b = self.border
-        self.setStyleSheet(
-            "QPushButton{"
-            f"border:2px solid rgb({b.red()},{b.green()},{b.blue()});"
-            "border-radius:10px;"
-            f"background: rgb({f.red()},{f.green()},{f.blue()});"
-            "}"
-            "QPushButton:hover { background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 rgba(255,255,255,50), stop:1 transparent); }"
-        )
+        css = _chip_stylesheet(f.red(), f.green(), f.blue(), b.red(), b.green(), b.blue())
+        # Reapplying a stylesheet makes Qt re parse it and repolish the widget, skip it when nothing changed.
+        if css != self._css:
+            self._css = css
+            self.setStyleSheet(css)
 
     def setFill(self, c: QtGui.QColor):
         self.fill = QtGui.QColor(c)
@@ -639,10 +972,13 @@ class DotChip(QtWidgets.QPushButton):
 
     def pick(self):
         d = AdvColorDlg(self.fill, self)
-        if ICON:
-            d.setWindowIcon(QtGui.QIcon(ICON))
+        if get_icon():
+            d.setWindowIcon(QtGui.QIcon(get_icon()))
+        d.colorChanged.connect(self.previewed)
         if d.exec() == QtWidgets.QDialog.Accepted:
             self.setFill(d.selectedColor())
+        else:
+            self.previewed.emit(QtGui.QColor(self.fill))
 
 class Panel(QtWidgets.QWidget):
     mapSel = QtCore.Signal(str)
@@ -650,6 +986,7 @@ class Panel(QtWidgets.QWidget):
     resetColors = QtCore.Signal()
     typeToggled = QtCore.Signal(str, bool)
     typeColor = QtCore.Signal(str, QtGui.QColor)
+    typePreview = QtCore.Signal(str, QtGui.QColor)
     scaleChanged = QtCore.Signal(float)
 
     requestBindEdit = QtCore.Signal(str)
@@ -689,8 +1026,12 @@ class Panel(QtWidgets.QWidget):
             row.addWidget(chip)
             v.addLayout(row)
             self.type_widgets[tkey] = (chk, chip)
-            chk.toggled.connect(lambda val, k=tkey: self.typeToggled.emit(k, val))
-            chip.changed.connect(lambda col, k=tkey: self.typeColor.emit(k, col))
+            # Shared slots read the type key back from the sending widget.
+            chk.setProperty("tkey", tkey)
+            chip.setProperty("tkey", tkey)
+            chk.toggled.connect(self._type_toggled)
+            chip.changed.connect(self._type_color_changed)
+            chip.previewed.connect(self._type_color_previewed)
 
             if tkey == "possible_xp":
                 line = QtWidgets.QFrame()
@@ -758,7 +1099,8 @@ class Panel(QtWidgets.QWidget):
             row.addWidget(btn)
             v.addLayout(row)
             self.kb_rows[action] = btn
-            btn.clicked.connect(lambda _, a=action: self.requestBindEdit.emit(a))
+            btn.setProperty("action", action)
+            btn.clicked.connect(self._bind_edit_clicked)
 
         v.addSpacing(8)
 
@@ -785,6 +1127,18 @@ class Panel(QtWidgets.QWidget):
 
         v.addStretch(1)
 
+    def _type_toggled(self, val: bool):
+        self.typeToggled.emit(str(self.sender().property("tkey")), bool(val))
+
+    def _type_color_changed(self, col: QtGui.QColor):
+        self.typeColor.emit(str(self.sender().property("tkey")), col)
+
+    def _type_color_previewed(self, col: QtGui.QColor):
+        self.typePreview.emit(str(self.sender().property("tkey")), col)
+
+    def _bind_edit_clicked(self):
+        self.requestBindEdit.emit(str(self.sender().property("action")))
+
     def _dec_scale(self):
         self.scale_box.setValue(max(self.scale_box.minimum(), self.scale_box.value() - 0.05))
 
@@ -811,31 +1165,53 @@ class Panel(QtWidgets.QWidget):
         self.help.setText(txt)
 
 class Overlay(QtWidgets.QWidget):
+    # Emitted from the save pool thread with (digest, ok) after each config write, see _write_config.
+    configWritten = QtCore.Signal(object, bool)
+
     def __init__(self):
         super().__init__(None, QtCore.Qt.FramelessWindowHint | QtCore.Qt.WindowStaysOnTopHint | QtCore.Qt.Tool)
 
         self.tab_blocked = False
 
+        # Settings writes are coalesced, see _save.
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(250)
+        self._save_timer.timeout.connect(self._save_now)
+        # Digest of the last bytes written by _save_now, unchanged settings skip the disk write.
+        self._last_saved_hash = None
+        # Config writes run off the UI thread. One worker keeps them in order, so the newest wins.
+        self._save_pool = QtCore.QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
+        # Queued, so _last_saved_hash is only ever touched on the UI thread.
+        self.configWritten.connect(self._on_config_written, QtCore.Qt.QueuedConnection)
+
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         self.setAttribute(QtCore.Qt.WA_ShowWithoutActivating, True)
         self.setFocusPolicy(QtCore.Qt.NoFocus)
         self.setMouseTracking(False)
 
-        if ICON:
-            QtWidgets.QApplication.instance().setWindowIcon(QtGui.QIcon(ICON))
-            self.setWindowIcon(QtGui.QIcon(ICON))
+        icon = get_icon()
+        if icon:
+            QtWidgets.QApplication.instance().setWindowIcon(QtGui.QIcon(icon))
+            self.setWindowIcon(QtGui.QIcon(icon))
 
-        if not os.path.isfile(DATA_PATH):
+        data_path, style_path = get_data_path(), get_style_path()
+        if not os.path.isfile(data_path):
             raise RuntimeError(f"Missing data.json in {udir()}")
-        if not os.path.isfile(STYLE_PATH):
+        if not os.path.isfile(style_path):
             raise RuntimeError(f"Missing poiData.json in {udir()}")
 
-        self.game_data = load_json(DATA_PATH)
-        self.fmt = detect_data_format(self.game_data)
+        # Only the per map blocks are kept, each is dropped once its map is indexed.
+        game_data = load_json(data_path)
+        self.fmt = detect_data_format(game_data)
         if self.fmt == "unknown":
             raise RuntimeError("Unrecognized data.json format")
+        self._map_blocks = build_map_index(game_data, self.fmt)
+        del game_data
 
-        self.poi_style = load_json(STYLE_PATH)
+        self.poi_style = load_json(style_path)
+        self._style_by_cat = build_style_index(self.poi_style)
 
         # Order of types controls draw order and GUI ordering.
         self.type_order = [
@@ -854,8 +1230,44 @@ class Overlay(QtWidgets.QWidget):
 
         self.type_specs = self._build_type_specs()
 
-        W, H = screenWH()
+        # Flat POI table keyed by (map, category). Maps are indexed on first use, see _ensure_map_indexed.
+        # It must exist before config load because _apply_rect projects the selected map.
+        self.poi_index = {}
+        self._indexed_maps = set()
+        self.screen_pts = {}
+        # Projected screen_pts per (map, rect), so switching back to a map does not re project it.
+        self._screen_cache = {}
+        # Hidden flags per (map, category), aligned with poi_index, see _hidden_mask.
+        self.hidden_sets = {}
+        self._hidden_masks = {}
+        # Hover state, computed from the cursor position when hide_hovered fires.
+        self.hover = None
+        self.hover_radius = 10
+        # Hover grid over the rect as (left, top, cell, cols, rows), see build_grid.
+        self._grid = None
+
+        # Paint objects per type, rebuilt only when a color or the scale changes, see _refresh_stamps.
+        # _atlas[tkey] = (circle pixmap for the type's color and scaled radius, blit offset).
+        # The offset is the scaled radius plus the border, computed once per scale change.
+        self._atlas = {}
+        # (key, layout) of the map label, see _label_layout.
+        self._label = None
+
+        # Colors shown while a picker is open. Paint uses these over self.types, which only
+        # changes when the pick is committed and is what gets saved.
+        self._live_colors = {}
+
+        # Screen area the POIs and map label cover, repaints are limited to it, see _refresh_paint_region.
+        self._paint_region = QtGui.QRegion()
+
+        # Screen size is cached and refreshed from geometryChanged instead of queried per rect update.
+        # The watched screen follows the primary one, see _on_primary_screen_changed.
+        self._screen_wh = screenWH()
+        W, H = self._screen_wh
         self.aspect = detect_aspect_label(W, H)
+        self._screen = QtGui.QGuiApplication.primaryScreen()
+        self._screen.geometryChanged.connect(self._on_screen_changed)
+        QtGui.QGuiApplication.instance().primaryScreenChanged.connect(self._on_primary_screen_changed)
 
         self.data = load_or_replace_config()
         self._load_state_from_config(self.data)
@@ -873,15 +1285,16 @@ class Overlay(QtWidgets.QWidget):
         }
         help_text = self._build_help_text()
         self.panel = Panel(self.type_order, self.type_specs, self.global_scale, help_text, binds_label_map, self.minimize_to_tray)
-        if ICON:
-            self.panel.setWindowIcon(QtGui.QIcon(ICON))
+        if get_icon():
+            self.panel.setWindowIcon(QtGui.QIcon(get_icon()))
 
         # Wire GUI events.
         self.panel.tnums.connect(self._set_num_switch)
         self.panel.mapSel.connect(self.switch)
         self.panel.resetColors.connect(self._reset_colors)
         self.panel.typeToggled.connect(self._type_toggle)
-        self.panel.typeColor.connect(self._type_color)
+        self.panel.typeColor.connect(self._commit_type_color)
+        self.panel.typePreview.connect(self._type_preview)
         self.panel.scaleChanged.connect(self._scale_changed)
         self.panel.requestBindEdit.connect(self._edit_keybind)
         self.panel.resetConfig.connect(self._reset_config_to_defaults)
@@ -913,36 +1326,66 @@ class Overlay(QtWidgets.QWidget):
         topmost(int(self.winId()))
 
         # Edge detection for hotkeys so they do not toggle repeatedly while held.
-        self.p_toggle_master = False
-        self.p_hide = False
-        self.p_toggle_overlay = False
-        self.p_hide_hovered = False
-
-        # Hover state is computed each tick when visible.
-        self.hover = None
-        self.hover_radius = 10
+        # _keys holds this tick's state of every tracked virtual key, _prev_binds last tick's bind states.
+        self._keys = bytearray(256)
+        self._prev_binds = {}
+        self._polled_vks = ()
 
-        # Cache computed point lists per map to avoid rebuilding every frame.
-        self.cache = {}
-        self._rebuild_all_caches()
+        # hide_hovered is delivered as WM_HOTKEY when it can be registered, see _register_hide_hotkey.
+        self._hide_hotkey = False
+        self._register_hide_hotkey()
 
         # Save once at the end to ensure config contains any missing keys we added.
         self._save()
 
-        # Timer tick drives input polling and hover updates.
+        # Timer tick drives hotkey polling.
         self.t = QtCore.QTimer(self)
         self.t.timeout.connect(self._tick_safe)
-        self.t.start(16)
+        self.t.start(TICK_MS)
 
         # Minimize to tray needs access to the panel state changes.
         self.panel.installEventFilter(self)
 
+        # Write any pending settings before the app exits.
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self._flush_save)
+
+        # Get the hover kernel ready once the event loop runs, after the first paint.
+        QtCore.QTimer.singleShot(0, warm_nearest_poi)
+
     def _move_to_primary_screen(self):
         screen = QtGui.QGuiApplication.primaryScreen()
         geom = screen.geometry()
 
         self.setGeometry(geom)
 
+    def _on_primary_screen_changed(self, screen):
+        """
+        Another display became primary. Watch its geometry from now on and re project for it.
+        """
+        if self._screen is not None:
+            try:
+                self._screen.geometryChanged.disconnect(self._on_screen_changed)
+            except (RuntimeError, TypeError):
+                # The old screen may already be gone when it was unplugged.
+                pass
+        self._screen = screen
+        if screen is not None:
+            screen.geometryChanged.connect(self._on_screen_changed)
+            self._on_screen_changed()
+
+    def _on_screen_changed(self, _geom=None):
+        """
+        Primary screen resolution changed. Re detect the aspect, then re project the rect
+        and POI pixel coordinates once for the new size. Stamps are rebuilt for the new pixel ratio.
+        """
+        self._screen_wh = screenWH()
+        self.aspect = detect_aspect_label(*self._screen_wh)
+        self._move_to_primary_screen()
+        self._refresh_all_stamps()
+        self._apply_rect()
+        self.panel.setHelpText(self._build_help_text())
+        self._repaint()
+
     def eventFilter(self, obj, ev):
         if obj is self.panel:
             if ev.type() == QtCore.QEvent.WindowStateChange:
@@ -960,8 +1403,8 @@ class Overlay(QtWidgets.QWidget):
             return
 
         self.tray = QtWidgets.QSystemTrayIcon(self)
-        if ICON:
-            self.tray.setIcon(QtGui.QIcon(ICON))
+        if get_icon():
+            self.tray.setIcon(QtGui.QIcon(get_icon()))
         else:
             self.tray.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_ComputerIcon))
 
@@ -1014,7 +1457,7 @@ class Overlay(QtWidgets.QWidget):
         }
 
         def add_from_style(category, fallback_label):
-            spec = find_style_by_category(self.poi_style, category) or {}
+            spec = find_style_by_category(self._style_by_cat, category) or {}
             label = spec.get("label", fallback_label)
             border = qcolor_from_any(spec.get("borderColor", "#555555"), QtGui.QColor("#555555"))
             fill = qcolor_from_any(spec.get("fillColor", "#B4B4B4"), QtGui.QColor("#B4B4B4"))
@@ -1086,6 +1529,7 @@ class Overlay(QtWidgets.QWidget):
         self.minimize_to_tray = bool(st.get("minimize_to_tray", False))
 
         self.binds = self._normalize_keybinds(st.get("keybinds", {}))
+        self._refresh_tracked_keys()
 
         # Per type settings.
         self.types = st.get("types", {})
@@ -1098,6 +1542,7 @@ class Overlay(QtWidgets.QWidget):
                 self.types[k]["enabled"] = True
             if "color" not in self.types[k]:
                 self.types[k]["color"] = q2rgb(self.type_specs[k]["default_fill"])
+        self._refresh_all_stamps()
 
         # Hidden lists.
         self.hidden = st.get("hidden", {})
@@ -1116,24 +1561,126 @@ class Overlay(QtWidgets.QWidget):
                 px.append(s)
         self.hidden["possible_xp"] = px
 
-        self.hidden_sets = {k: set(self.hidden.get(k, [])) for k in self.type_order}
+        # In memory the hidden keys are integer ids, see hide_id. config.json keeps the string form.
+        # Entries that are not a key hide_id_to_key would write never matched a POI, not even before
+        # the ids. They are kept as written in _hidden_extra so saving does not drop them.
+        old_sets, self.hidden_sets = self.hidden_sets, {}
+        self._hidden_extra = {}
+        for k in self.type_order:
+            ids, extra = set(), set()
+            for s in self.hidden.get(k, []):
+                i = hide_id_from_key(k, s)
+                if i is not None and hide_id_to_key(i) == s:
+                    ids.add(i)
+                else:
+                    extra.add(str(s))
+            self.hidden_sets[k] = ids
+            self._hidden_extra[k] = extra
+            if extra:
+                print(f"config.json: keeping {len(extra)} hidden {k} entries that match no POI key", flush=True)
+
+        # Sorted string copies of the hidden lists for the config file, re sorted only for categories
+        # in _hidden_dirty.
+        self._hidden_sorted = {}
+        self._hidden_dirty = set(self.type_order)
+
+        # Masks and cached projections only go stale for categories whose hidden set changed.
+        changed = {k for k in self.type_order if self.hidden_sets[k] != old_sets.get(k)}
+        if changed:
+            for mk in [mk for mk in self._hidden_masks if mk[1] in changed]:
+                del self._hidden_masks[mk]
+            self._screen_cache.clear()
 
         # Apply aspect aware rect.
         self.rect = None
         self._apply_rect()
 
+    def _refresh_tracked_keys(self):
+        """
+        The virtual keys read each tick, per overlay state. GetKeyboardState cannot be used here
+        because the overlay never has focus, so each key costs one GetAsyncKeyState call.
+        Only the binds _tick can act on in a state are read:
+          0 master off                 toggle_master
+          1 master on, overlay hidden  toggle_master, toggle_overlay
+          2 overlay visible            every bind except hide_hovered (delivered as WM_HOTKEY)
+          3 overlay visible            every bind, hide_hovered polled with its modifiers
+        Ctrl and Alt are added whenever a bind in the state is Tab, for the Tab block.
+        """
+        def vks_for(names):
+            vks = set()
+            for name in names:
+                try:
+                    vk = int(self.binds.get(name, {}).get("vk", 0))
+                except:
+                    continue
+                if 0 < vk < 256:
+                    vks.add(vk)
+            if VK_TAB in vks:
+                vks.update((VK_CONTROL, VK_MENU))
+            return vks
+
+        visible = [n for n in self.binds if n != "hide_hovered"]
+        polled = vks_for(visible + ["hide_hovered"]) | {VK_CONTROL, VK_MENU, VK_SHIFT}
+        self._tracked_vks = (
+            tuple(sorted(vks_for(["toggle_master"]))),
+            tuple(sorted(vks_for(["toggle_master", "toggle_overlay"]))),
+            tuple(sorted(vks_for(visible))),
+            tuple(sorted(polled)),
+        )
+
+    def _poll_keys(self):
+        if not self.master:
+            vks = self._tracked_vks[0]
+        elif not self.visible:
+            vks = self._tracked_vks[1]
+        else:
+            vks = self._tracked_vks[2 if self._hide_hotkey else 3]
+
+        # The high bit of the SHORT result is the "down" state, so a pressed key reads as negative.
+        _g = GetKey
+        keys = self._keys
+        if vks is not self._polled_vks:
+            # Keys that stop being read would otherwise keep their last state, release them.
+            old = set(self._polled_vks)
+            for vk in old.difference(vks):
+                keys[vk] = 0
+            # Keys that stay keep their state. Keys that join start at their current state, and the
+            # previous bind states are taken from that, so a key already held when the set changes
+            # (showing the overlay, a map switch) is not seen as a new press.
+            added = set(vks).difference(old)
+            for vk in added:
+                keys[vk] = 0x80 if _g(vk) < 0 else 0
+            if added:
+                self._prev_binds = {name: self._bind_pressed(name) for name in self.binds}
+            self._polled_vks = vks
+
+        for vk in vks:
+            keys[vk] = 0x80 if _g(vk) < 0 else 0
+
+    def _bind_edges(self) -> tuple:
+        """
+        Evaluates every bind against the current key snapshot.
+        Returns (down, pressed): the binds held now and the ones that went down this tick.
+        """
+        down = {name: self._bind_pressed(name) for name in self.binds}
+        prev = self._prev_binds
+        pressed = {name for name, d in down.items() if d and not prev.get(name, False)}
+        self._prev_binds = down
+        return down, pressed
+
     def _bind_pressed(self, name: str) -> bool:
         b = self.binds.get(name, {})
         try:
             vk = int(b.get("vk", 0))
         except:
             return False
-        if vk == 0:
+        if not 0 < vk < 256:
             return False
+        keys = self._keys
 
         # Suppress Tab when used with Alt, Ctrl, or Shift
         if vk == VK_TAB:
-            modifier_down = key(VK_MENU) or key(VK_CONTROL)
+            modifier_down = keys[VK_MENU] or keys[VK_CONTROL]
 
             if modifier_down:
                 # Tab pressed with a modifier → block until Tab is released
@@ -1143,7 +1690,7 @@ class Overlay(QtWidgets.QWidget):
             if self.tab_blocked:
                 # Modifier was held when Tab was first pressed
                 # Keep blocking until Tab is released
-                if not key(VK_TAB):
+                if not keys[VK_TAB]:
                     self.tab_blocked = False
                 return False
 
@@ -1151,12 +1698,11 @@ class Overlay(QtWidgets.QWidget):
             need_ctrl = bool(b.get("ctrl", True))
             need_alt = bool(b.get("alt", True))
             need_shift = bool(b.get("shift", True))
-            if need_ctrl and not key(VK_CONTROL): return False
-            if need_alt and not key(VK_MENU): return False
-            if need_shift and not key(VK_SHIFT): return False
-            return key(vk)
+            if need_ctrl and not keys[VK_CONTROL]: return False
+            if need_alt and not keys[VK_MENU]: return False
+            if need_shift and not keys[VK_SHIFT]: return False
 
-        return key(vk)
+        return bool(keys[vk])
 
     def _bind_label(self, name: str) -> str:
         b = self.binds.get(name, {})
@@ -1190,6 +1736,15 @@ class Overlay(QtWidgets.QWidget):
         )
 
     def _save(self):
+        """
+        Schedules a config write.
+        Toggles, color picks and scale ticks tend to arrive in bursts. Each call restarts
+        the 250 ms timer, so a burst is written once by _save_now after it settles.
+        """
+        self._save_timer.start()
+
+    def _save_now(self):
+        self._save_timer.stop()
         st = self.data.setdefault("settings", {})
         self.data["version"] = CONFIG_VERSION
 
@@ -1203,10 +1758,51 @@ class Overlay(QtWidgets.QWidget):
         st["types"] = self.types
         st["keybinds"] = self.binds
 
-        # Persist hidden sets.
-        st["hidden"] = {k: sorted(list(self.hidden_sets.get(k, set()))) for k in self.type_order}
+        # Persist hidden sets. Sorting the key strings keeps the file stable and in the order it always
+        # had, unchanged categories reuse the last sort.
+        for k in self._hidden_dirty:
+            keys = [hide_id_to_key(i) for i in self.hidden_sets.get(k, set())]
+            self._hidden_sorted[k] = sorted(keys + list(self._hidden_extra.get(k, ())))
+        self._hidden_dirty.clear()
+        st["hidden"] = {k: self._hidden_sorted.get(k, []) for k in self.type_order}
+
+        try:
+            buf = dump_json(self.data)
+        except:
+            return
+        h = hashlib.blake2b(buf, digest_size=16).digest()
+        if h == self._last_saved_hash:
+            return
+
+        # Serializing stays here since it reads live state, only the file write goes to the worker.
+        self._last_saved_hash = h
+        self._save_pool.start(lambda: self._write_config(buf, h))
+
+    def _write_config(self, buf: bytes, h: bytes):
+        # Runs on the save pool thread, the result goes back through configWritten.
+        try:
+            write_file_atomic(get_config_path(), buf)
+        except:
+            self.configWritten.emit(h, False)
+            return
+        self.configWritten.emit(h, True)
+
+    def _on_config_written(self, h: bytes, ok: bool):
+        # A failed write lets the next _save_now retry the same bytes, unless newer ones were queued since.
+        if not ok and self._last_saved_hash == h:
+            self._last_saved_hash = None
 
-        save_json(CONFIG_PATH, self.data)
+    def _flush_save(self):
+        """
+        Writes any pending change and waits for the worker, so nothing is lost on quit.
+        """
+        if self._save_timer.isActive():
+            self._save_now()
+        self._save_pool.waitForDone()
+
+    def closeEvent(self, ev):
+        self._flush_save()
+        super().closeEvent(ev)
 
     def _apply_rect(self):
         """
@@ -1218,13 +1814,154 @@ class Overlay(QtWidgets.QWidget):
         if not isinstance(rr, dict):
             rr = default_rect_ratio_by_aspect().get(self.aspect, default_rect_ratio_16_9())
 
-        W, H = screenWH()
+        W, H = self._screen_wh
         self.rect = QtCore.QRect(
             int(rr["rx"] * W),
             int(rr["ry"] * H),
             max(1, int(rr["rw"] * W)),
             max(1, int(rr["rh"] * H))
         )
+        self._update_screen_pts()
+
+    def _update_screen_pts(self):
+        """
+        Projects the selected map's u,v arrays into pixel coordinates for the current rect.
+        Runs on rect or map changes only, paint and hover read self.screen_pts directly.
+        self.screen_pts[tkey] is a PointArray. Results are cached per (map, rect).
+        """
+        self.screen_pts = {}
+        if not self.rect:
+            return
+        r = self.rect
+        cell = max(1, int(self.hover_radius))
+        self._grid = (r.left(), r.top(), cell, r.width() // cell + 1, r.height() // cell + 1)
+        ck = (self.prof, r.left(), r.top(), r.width(), r.height())
+        cached = self._screen_cache.get(ck)
+        if cached is not None:
+            self.screen_pts = cached
+            self._refresh_xp_hover_skip()
+            self._refresh_paint_region()
+            return
+
+        self._ensure_map_indexed(self.prof)
+        left, top = np.float32(r.left()), np.float32(r.top())
+        w, h = np.float32(r.width()), np.float32(r.height())
+        for tkey in self.type_order:
+            u, v, ids = self.poi_index.get((self.prof, tkey), (None, None, None))
+            if u is None or not len(u):
+                self.screen_pts[tkey] = PointArray.empty()
+                continue
+            px = np.rint(left + u * w).astype(np.int32)
+            py = np.rint(top + v * h).astype(np.int32)
+            mask = self._hidden_mask(self.prof, tkey)
+            pts = PointArray(px, py, ids, mask)
+            pts.order, pts.starts = build_grid(px, py, self._grid)
+            self.screen_pts[tkey] = pts
+        self._screen_cache[ck] = self.screen_pts
+        self._refresh_xp_hover_skip()
+        self._refresh_paint_region()
+
+    def _hidden_mask(self, m: str, tkey: str):
+        """
+        Bool array aligned with poi_index[(m, tkey)], True for hidden POIs. Built from hidden_sets
+        the first time the map is projected, afterwards _hide_hovered sets single entries in place.
+        """
+        mask = self._hidden_masks.get((m, tkey))
+        if mask is None:
+            ids = self.poi_index[(m, tkey)][2]
+            hidden = self.hidden_sets.get(tkey, set())
+            mask = np.fromiter((i in hidden for i in ids.tolist()), dtype=bool, count=len(ids))
+            self._hidden_masks[(m, tkey)] = mask
+        return mask
+
+    def _refresh_xp_hover_skip(self):
+        """
+        A possible_xp point sits on the same pixel as its source POI, and the source comes later
+        in type_order, so it wins the distance tie in _update_hover whenever it is enabled and not
+        hidden. Those possible_xp points are skipped outright instead of being tested twice.
+        Paint still draws them, their larger circle shows as a ring around the source.
+        """
+        pts = self.screen_pts.get("possible_xp")
+        if not pts:
+            return
+        owned = [
+            self.screen_pts[c].hidden if self.types.get(c, {}).get("enabled", True) else np.ones(len(self.screen_pts[c]), dtype=bool)
+            for c in XP_SOURCES
+        ]
+        pts.hover_skip = pts.hidden | ~np.concatenate(owned)
+
+    def _label_layout(self):
+        """
+        Text, font and rect of the map label at top right.
+        Cached until the map, aspect or widget width changes, paint reuses the same font and rect.
+        """
+        key = (self.prof, self.aspect, self.width())
+        if self._label is not None and self._label[0] == key:
+            return self._label[1]
+        m = 20
+        txt = f"{self.prof}  ({self.aspect})"
+        f = QtGui.QFont(self.font())
+        f.setBold(True)
+        fm = QtGui.QFontMetrics(f)
+        tw, th = fm.horizontalAdvance(txt), fm.height()
+        layout = (txt, f, QtCore.QRectF(self.width() - m - tw - 16, m, tw + 16, th + 10))
+        self._label = (key, layout)
+        return layout
+
+    def _refresh_paint_region(self):
+        """
+        Union of the per type POI bounding boxes, inflated by the scaled radius, and the map label.
+        The overlay is fullscreen, so repainting only this keeps compositing to the area that is drawn.
+        """
+        region = QtGui.QRegion(self._label_layout()[2].toAlignedRect().adjusted(-1, -1, 1, 1))
+        for tkey, pts in self.screen_pts.items():
+            if not len(pts):
+                continue
+            r = self._atlas[tkey][1]
+            x0, y0 = int(pts.x.min()), int(pts.y.min())
+            region += QtCore.QRect(x0 - r, y0 - r, int(pts.x.max()) - x0 + 2 * r + 1, int(pts.y.max()) - y0 + 2 * r + 1)
+        # Repaint the old area as well so anything outside the new one is cleared.
+        old, self._paint_region = self._paint_region, region
+        self._repaint(old + region)
+
+    def _repaint(self, region=None):
+        """
+        Schedules a repaint of the POI area, nothing is painted while the overlay is hidden.
+        """
+        if not (self.master and self.visible):
+            return
+        self.update(self._paint_region if region is None else region)
+
+    def resizeEvent(self, ev):
+        super().resizeEvent(ev)
+        self._refresh_paint_region()
+
+    def _scaled_radius(self, tkey: str) -> int:
+        scaled = int(round(int(self.type_specs[tkey]["radius_px"]) * float(self.global_scale)))
+        if scaled < 1: scaled = 1
+        if scaled > 40: scaled = 40
+        return scaled
+
+    def _refresh_stamps(self, tkey: str):
+        fill = self._live_colors.get(tkey)
+        if fill is None:
+            fill = rgb2q(self.types[tkey].get("color"), self.type_specs[tkey]["default_fill"])
+        border = QtGui.QColor(self.type_specs[tkey]["border"])
+        scaled = self._scaled_radius(tkey)
+        stamp = point_stamp(fill.rgba(), border.rgba(), scaled, self.devicePixelRatioF())
+        self._atlas[tkey] = (stamp, scaled + 2)
+
+    def _refresh_all_stamps(self):
+        for k in self.type_order:
+            self._refresh_stamps(k)
+
+    def _refresh_visuals(self):
+        """
+        Paint side rebuild for color and scale changes: stamps and the repaint region.
+        POI geometry (poi_index, screen_pts, hidden masks) is left alone.
+        """
+        self._refresh_all_stamps()
+        self._refresh_paint_region()
 
     def _set_num_switch(self, v: bool):
         self.num_sw = bool(v)
@@ -1233,44 +1970,68 @@ class Overlay(QtWidgets.QWidget):
     def _type_toggle(self, tkey: str, enabled: bool):
         if tkey in self.types:
             self.types[tkey]["enabled"] = bool(enabled)
+            if tkey in XP_SOURCES:
+                self._refresh_xp_hover_skip()
             self._save()
-            self.update()
+            self._repaint()
+
+    def _type_preview(self, tkey: str, color: QtGui.QColor):
+        """
+        Live color while the picker is open. Only the paint objects change, nothing is saved.
+        """
+        if tkey not in self.types:
+            return
+        c = QtGui.QColor(color)
+        if q2rgb(c) == self.types[tkey].get("color"):
+            self._live_colors.pop(tkey, None)
+        else:
+            self._live_colors[tkey] = c
+        self._refresh_stamps(tkey)
+        self._repaint()
 
-    def _type_color(self, tkey: str, color: QtGui.QColor):
+    def _commit_type_color(self, tkey: str, color: QtGui.QColor):
         if tkey in self.types:
+            self._live_colors.pop(tkey, None)
             self.types[tkey]["color"] = q2rgb(QtGui.QColor(color))
+            self._refresh_stamps(tkey)
             self._save()
-            self.update()
+            self._repaint()
 
     def _scale_changed(self, scale: float):
         self.global_scale = float(scale)
         if self.global_scale < 0.10: self.global_scale = 0.10
         if self.global_scale > 5.00: self.global_scale = 5.00
+        self._refresh_visuals()
         self._save()
-        self.update()
+        self._repaint()
 
     def _reset_colors(self):
         for k in self.type_order:
             self.types[k]["enabled"] = True
             self.types[k]["color"] = q2rgb(self.type_specs[k]["default_fill"])
             self.panel.setTypeState(k, True, self.type_specs[k]["default_fill"])
+        self._live_colors.clear()
+        self._refresh_xp_hover_skip()
+        self._refresh_visuals()
         self._save()
-        self.update()
+        self._repaint()
 
     def _reset_config_to_defaults(self):
         """
         Overwrites config.json with fresh defaults and reloads state immediately.
         This does not touch data.json or poiData.json.
         """
+        # A pending or running background write must not land on top of the fresh file.
+        self._save_timer.stop()
+        self._save_pool.waitForDone()
         fresh = build_default_config()
-        save_json(CONFIG_PATH, fresh)
+        save_json(get_config_path(), fresh)
+        self._last_saved_hash = None
 
+        # Loading re applies the map selection and rectangle, the selected map may have changed.
         self.data = load_or_replace_config()
         self._load_state_from_config(self.data)
 
-        # Re apply map selection and rectangle because the selected map may have changed.
-        self._apply_rect()
-
         # Push state back into GUI widgets.
         self.panel.chk_nums.setChecked(self.num_sw)
         self.panel.chk_tray.setChecked(self.minimize_to_tray)
@@ -1282,84 +2043,90 @@ class Overlay(QtWidgets.QWidget):
 
         # Refresh help text because keybinds and aspect might differ.
         self.panel.setHelpText(self._build_help_text())
+        self._register_hide_hotkey()
 
         # Apply overlay visibility state.
         (self.show if self.visible and self.master else self.hide)()
         self._save()
-        self.update()
+        self._repaint()
 
     def switch(self, name: str):
         if name in MAPS and name != self.prof:
             self.prof = name
             self._apply_rect()
             self._save()
-            self.update()
-
-    def _rebuild_all_caches(self):
-        for m in MAPS:
-            self.cache[m] = self._build_points_for_map(m)
-
-    def _build_points_for_map(self, map_name: str):
-        block = get_map_block(self.game_data, self.fmt, map_name)
-        out = {k: [] for k in self.type_order}
-        if not block:
-            return out
-
-        def build_for_category(cat: str):
-            items = get_category_list(block, self.fmt, cat)
-            pts = []
-            for it in items:
-                if not isinstance(it, dict):
-                    continue
-                c = it.get("c")
-                if not c or len(c) < 2:
-                    continue
-                try:
-                    x, y = float(c[0]), float(c[1])
-                except:
-                    continue
-                u, v = rotate90cw_norm(x, y)
-                pts.append({"u": u, "v": v, "x": x, "y": y, "raw": it, "src": cat})
-            return pts
+            self._repaint()
 
+    def _ensure_map_indexed(self, m: str):
+        """
+        Flattens one map of game_data into self.poi_index[(map, category)] = (u, v, hide_ids).
+        u and v are float32 arrays of normalized coordinates, hide_ids a parallel int64 array.
+        Each map is indexed once, the first time it is selected. Paint and hover never walk game_data,
+        so the map's parsed block is released here.
+        """
+        if m in self._indexed_maps:
+            return
+        self._indexed_maps.add(m)
+        block = self._map_blocks.pop(m, None)
         for cat in self.type_order:
             if cat == "possible_xp":
                 continue
-            out[cat] = build_for_category(cat)
-
-        union = []
-        for src in ("towers", "big_towers", "armories"):
-            union.extend(out.get(src, []))
-        out["possible_xp"] = union
-
-        return out
+            self.poi_index[(m, cat)] = self._index_category(block, cat)
+
+        # possible_xp is the XP_SOURCES points in that order, point i of possible_xp is the same
+        # POI as the matching entry of its source. Only the hide ids differ, they carry the source.
+        srcs = [self.poi_index[(m, c)] for c in XP_SOURCES]
+        self.poi_index[(m, "possible_xp")] = (
+            np.concatenate([u for u, _, _ in srcs]),
+            np.concatenate([v for _, v, _ in srcs]),
+            np.concatenate([ids | np.int64((n + 1) << 32) for n, (_, _, ids) in enumerate(srcs)]),
+        )
 
-    def _hidden_key(self, tkey: str, pt: dict) -> str:
+    def _index_category(self, block, cat: str):
         """
-        Stable hide id.
-        For possible_xp we include src so hiding only affects possible_xp entries.
-        For other categories use xi:yi.
+        u, v and hide ids for the POIs of one category.
         """
-        xi = int(round(float(pt.get("x", 0))))
-        yi = int(round(float(pt.get("y", 0))))
-        if tkey == "possible_xp":
-            src = str(pt.get("src", ""))
-            return f"{src}:{xi}:{yi}"
-        return f"{xi}:{yi}"
+        xs, ys = [], []
+        for it in get_category_list(block, self.fmt, cat):
+            if not isinstance(it, dict):
+                continue
+            c = it.get("c")
+            if not c or len(c) < 2:
+                continue
+            try:
+                x, y = float(c[0]), float(c[1])
+            except:
+                continue
+            xs.append(x)
+            ys.append(y)
 
-    def _is_hidden(self, tkey: str, pt: dict) -> bool:
-        return self._hidden_key(tkey, pt) in self.hidden_sets.get(tkey, set())
+        # Hide ids come from the float64 coordinates so rounding matches the config keys.
+        x64 = np.asarray(xs, dtype=np.float64)
+        y64 = np.asarray(ys, dtype=np.float64)
+        ids = hide_ids(x64, y64, np.zeros(len(xs), dtype=np.int64))
+
+        u, v = rotate90cw_norm_vec(x64, y64)
+        return u, v, ids
 
     def _hide_hovered(self):
         if self.hover is None:
             return
         tkey = self.hover["type"]
-        pt = self.hover["pt_ref"]
-        hk = self._hidden_key(tkey, pt)
+        hk = self.hover["hide_id"]
         self.hidden_sets.setdefault(tkey, set()).add(hk)
+        self._hidden_dirty.add(tkey)
+        # The mask is shared by every cached projection of the map, paint reads it directly.
+        idx = self.hover["index"]
+        self._hidden_mask(self.prof, tkey)[idx] = True
+        if tkey == "possible_xp" or tkey in XP_SOURCES:
+            self._refresh_xp_hover_skip()
         self._save()
         self.hover = None
-        self.update()
+
+        # Only the hidden POI's stamp changes on screen.
+        pts = self.screen_pts[tkey]
+        o = self._atlas[tkey][1]
+        self._repaint(QtCore.QRect(int(pts.x[idx]) - o, int(pts.y[idx]) - o, 2 * o + 1, 2 * o + 1))
 
     def _update_hover(self):
         self.hover = None
@@ -1370,27 +2137,67 @@ class Overlay(QtWidgets.QWidget):
         lp = self.mapFromGlobal(gp)
         mx, my = float(lp.x()), float(lp.y())
 
-        pts_by_type = self.cache.get(self.prof, {})
-        best = None
+        win = grid_window(self._grid, mx, my) if self._grid else None
+        if win is None:
+            return
+        gw = self._grid[3]
+
+        best_tkey, best_idx = None, -1
         best_d2 = float(self.hover_radius * self.hover_radius)
 
         for tkey in self.type_order:
             if not self.types.get(tkey, {}).get("enabled", True):
                 continue
 
-            for idx, pt in enumerate(pts_by_type.get(tkey, [])):
-                if self._is_hidden(tkey, pt):
-                    continue
-                cx = self.rect.left() + pt["u"] * self.rect.width()
-                cy = self.rect.top() + pt["v"] * self.rect.height()
-                dx = mx - cx
-                dy = my - cy
-                d2 = dx * dx + dy * dy
-                if d2 <= best_d2:
-                    best_d2 = d2
-                    best = {"map": self.prof, "type": tkey, "index": idx, "pt_ref": pt}
+            pts = self.screen_pts.get(tkey)
+            if not pts:
+                continue
+            # Passing the best distance so far keeps the closest POI across all types.
+            skip = pts.hidden if pts.hover_skip is None else pts.hover_skip
+            idx, d2 = nearest_poi(pts.x, pts.y, skip, pts.order, pts.starts, gw, *win, mx, my, best_d2)
+            if idx >= 0:
+                best_tkey, best_idx, best_d2 = tkey, int(idx), d2
+
+        if best_tkey is not None:
+            hid = int(self.screen_pts[best_tkey].ids[best_idx])
+            self.hover = {"map": self.prof, "type": best_tkey, "index": best_idx, "hide_id": hid}
+
+    def _register_hide_hotkey(self):
+        """
+        Registers hide_hovered as a Windows hotkey so it arrives as WM_HOTKEY instead of being polled.
+        Only modifier gated binds are registered. RegisterHotKey swallows the key system wide, which
+        is fine for Ctrl Alt Shift Delete but would break Tab, backtick and 1 to 4 in the game,
+        so those binds stay polled. If registration fails the tick keeps polling hide_hovered.
+        """
+        self._unregister_hide_hotkey()
+        hwnd = int(self.winId())
+
+        b = self.binds.get("hide_hovered", {})
+        mods = 0
+        if bool(b.get("ctrl", True)): mods |= MOD_CONTROL
+        if bool(b.get("alt", True)): mods |= MOD_ALT
+        if bool(b.get("shift", True)): mods |= MOD_SHIFT
+        try:
+            vk = int(b.get("vk", 0))
+        except:
+            vk = 0
+        if not mods or not vk:
+            return
 
-        self.hover = best
+        try:
+            self._hide_hotkey = bool(user32.RegisterHotKey(hwnd, HOTKEY_ID_HIDE_HOVERED, mods | MOD_NOREPEAT, vk))
+        except:
+            self._hide_hotkey = False
+
+    def nativeEvent(self, eventType, message):
+        if bytes(eventType) == b"windows_generic_MSG":
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message == WM_HOTKEY and msg.wParam == HOTKEY_ID_HIDE_HOVERED:
+                if self.master and self.visible:
+                    self._update_hover()
+                    self._hide_hovered()
+                return True, 0
+        return super().nativeEvent(eventType, message)
 
     def _tick_safe(self):
         try:
@@ -1399,50 +2206,52 @@ class Overlay(QtWidgets.QWidget):
             print("Overlay tick crashed:\n" + traceback.format_exc(), flush=True)
 
     def _tick(self):
-        nm = self._bind_pressed("toggle_master")
-        if nm and not self.p_toggle_master:
+        self._poll_keys()
+        down, pressed = self._bind_edges()
+
+        if "toggle_master" in pressed:
             self.master = not self.master
             if not self.master and self.visible:
                 self.visible = False
                 self.hide()
             self._save()
-        self.p_toggle_master = nm
 
-        nh = self._bind_pressed("hide_overlay")
-        if nh and not self.p_hide and self.visible:
+        if "hide_overlay" in pressed and self.visible:
             self.visible = False
             self.hide()
             self._save()
-        self.p_hide = nh
 
         if not self.master:
             return
 
-        nt = self._bind_pressed("toggle_overlay")
-        if nt and not self.p_toggle_overlay:
+        if "toggle_overlay" in pressed:
             self.visible = not self.visible
             (self.show if self.visible else self.hide)()
             if self.visible:
                 topmost(int(self.winId()))
             self._save()
-        self.p_toggle_overlay = nt
 
         # Map switching uses MAPS order. Since MAPS changed, 2 is Lawson and 3 is DeSalle.
         if self.visible and self.num_sw:
-            if self._bind_pressed("map_1"): self.switch(MAPS[0])
-            elif self._bind_pressed("map_2"): self.switch(MAPS[1])
-            elif self._bind_pressed("map_3"): self.switch(MAPS[2])
-            elif self._bind_pressed("map_4"): self.switch(MAPS[3])
+            for i, name in enumerate(("map_1", "map_2", "map_3", "map_4")):
+                if down[name]:
+                    self.switch(MAPS[i])
+                    break
 
-        if self.visible:
-            self._update_hover()
+        if not self.visible:
+            return
 
-        hide_now = self._bind_pressed("hide_hovered")
-        if hide_now and not self.p_hide_hovered:
+        # No repaint here. Hover is not drawn, and every state change above (show, switch,
+        # hide_hovered) schedules its own, so an idle tick leaves the frame alone. The cursor
+        # is only read when hide_hovered fires, the overlay is click through and gets no mouse events.
+        if not self._hide_hotkey and "hide_hovered" in pressed:
+            self._update_hover()
             self._hide_hovered()
-        self.p_hide_hovered = hide_now
 
-        self.update()
+    def _unregister_hide_hotkey(self):
+        if self._hide_hotkey:
+            user32.UnregisterHotKey(int(self.winId()), HOTKEY_ID_HIDE_HOVERED)
+            self._hide_hotkey = False
 
     def _edit_keybind(self, action: str):
         """
@@ -1451,10 +2260,20 @@ class Overlay(QtWidgets.QWidget):
         Modifiers are only applied to hide_hovered by design.
         """
         d = KeyCaptureDialog(action, self.panel)
-        if ICON:
-            d.setWindowIcon(QtGui.QIcon(ICON))
-
-        if d.exec() != QtWidgets.QDialog.Accepted:
+        if get_icon():
+            d.setWindowIcon(QtGui.QIcon(get_icon()))
+
+        # While capturing, the registered hide_hovered combo would arrive as WM_HOTKEY and hide a POI
+        # instead of reaching the dialog as a key press. Release it, and pause the tick so the polled
+        # binds do not fire either.
+        self.t.stop()
+        self._unregister_hide_hotkey()
+        try:
+            accepted = d.exec() == QtWidgets.QDialog.Accepted
+        finally:
+            self._register_hide_hotkey()
+            self.t.start(TICK_MS)
+        if not accepted:
             return
 
         b = d.result_bind
@@ -1467,58 +2286,53 @@ class Overlay(QtWidgets.QWidget):
             self.binds[action]["ctrl"] = bool(b.get("ctrl", True))
             self.binds[action]["alt"] = bool(b.get("alt", True))
             self.binds[action]["shift"] = bool(b.get("shift", True))
+            self._register_hide_hotkey()
 
+        self._refresh_tracked_keys()
         self._save()
         self.panel.setHelpText(self._build_help_text())
 
-    def paintEvent(self, _):
+    def paintEvent(self, ev):
         if not (self.master and self.visible and self.rect):
             return
 
-        p = QtGui.QPainter(self)
-        p.setRenderHint(QtGui.QPainter.Antialiasing)
+        # Partial repaints (a hidden POI, see _hide_hovered) only blit the stamps that reach the clip.
+        clip = ev.rect()
+        full = clip.contains(self._paint_region.boundingRect())
 
-        pts_by_type = self.cache.get(self.prof, {})
+        # Stamps are antialiased once when they are rendered, blitting them at integer
+        # positions needs no render hints. Only the label's rounded rect asks for it.
+        p = QtGui.QPainter(self)
 
         for tkey in self.type_order:
             if not self.types.get(tkey, {}).get("enabled", True):
                 continue
 
-            fill = rgb2q(self.types[tkey].get("color"), self.type_specs[tkey]["default_fill"])
-            border = self.type_specs[tkey]["border"]
-
-            base_rpx = int(self.type_specs[tkey]["radius_px"])
-            scaled = int(round(base_rpx * float(self.global_scale)))
-            if scaled < 1: scaled = 1
-            if scaled > 40: scaled = 40
-
-            p.setPen(QtGui.QPen(border, 2))
-            p.setBrush(fill)
-
-            for pt in pts_by_type.get(tkey, []):
-                if self._is_hidden(tkey, pt):
-                    continue
-                p.drawEllipse(
-                    QtCore.QPointF(
-                        self.rect.left() + pt["u"] * self.rect.width(),
-                        self.rect.top() + pt["v"] * self.rect.height()
-                    ),
-                    scaled, scaled
-                )
+            pts = self.screen_pts.get(tkey)
+            if not pts:
+                continue
+            sel = ~pts.hidden
+            if not sel.any():
+                continue
+            # Blit the pre rendered circle instead of tessellating one ellipse per POI.
+            stamp, o = self._atlas[tkey]
+            x, y = pts.x, pts.y
+            if not full:
+                sel &= (x >= clip.left() - o) & (x <= clip.right() + o) & (y >= clip.top() - o) & (y <= clip.bottom() + o)
+            for px, py in zip(x[sel].tolist(), y[sel].tolist()):
+                p.drawPixmap(px - o, py - o, stamp)
 
         # Map label at top right.
-        m = 20
-        txt = f"{self.prof}  ({self.aspect})"
-        f = p.font()
-        f.setBold(True)
+        txt, f, r = self._label_layout()
+        if not full and not clip.intersects(r.toAlignedRect()):
+            p.end()
+            return
+        p.setRenderHint(QtGui.QPainter.Antialiasing)
         p.setFont(f)
-        fm = QtGui.QFontMetrics(f)
-        tw, th = fm.horizontalAdvance(txt), fm.height()
-        r = QtCore.QRectF(self.width() - m - tw - 16, m, tw + 16, th + 10)
         p.setPen(QtCore.Qt.NoPen)
-        p.setBrush(QtGui.QColor(0, 0, 0, 150))
+        p.setBrush(LABEL_BG)
         p.drawRoundedRect(r, 8, 8)
-        p.setPen(QtGui.QPen(QtGui.QColor(230, 230, 230), 1))
+        p.setPen(LABEL_PEN)
         p.drawText(r.adjusted(8, 7, -8, -4), QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, txt)
         p.end()
 
@@ -1542,8 +2356,8 @@ if __name__ == "__main__":
         pal.setColor(role, color)
     app.setPalette(pal)
 
-    if ICON:
-        app.setWindowIcon(QtGui.QIcon(ICON))
+    if get_icon():
+        app.setWindowIcon(QtGui.QIcon(get_icon()))
 
     try:
         w = Overlay()